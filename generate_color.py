@@ -46,40 +46,41 @@ def hex_to_rgb(hexval):
     hexval = hexval.lstrip("#")
     return [int(hexval[i:i+2], 16) for i in (0, 2, 4)]
 
-def rgb_to_lab(rgb):
-    arr = np.uint8([[rgb]])
-    lab = cv2.cvtColor(arr, cv2.COLOR_RGB2LAB)[0][0]
-    L = lab[0] * 100.0 / 255.0
-    a = float(lab[1]) - 128.0
-    b = float(lab[2]) - 128.0
-    return [round(L, 2), round(a, 2), round(b, 2)]
+def rgb_to_lab_batch(rgbs):
+    # Semua warna dikonversi sekaligus dalam satu panggilan cvtColor (gambar 1xN)
+    arr = np.uint8([rgbs])
+    labs = cv2.cvtColor(arr, cv2.COLOR_RGB2LAB)[0]
+    result = []
+    for lab in labs:
+        L = lab[0] * 100.0 / 255.0
+        a = float(lab[1]) - 128.0
+        b = float(lab[2]) - 128.0
+        result.append([round(L, 2), round(a, 2), round(b, 2)])
+    return result
 
-colors = {}
+# (key, code, name, rgb) untuk tiap warna; LAB diisi setelahnya dalam satu batch
+entries = []
 
 # Masukkan semua warna standar CSS/X11
 for idx, (name, hexval) in enumerate(css_colors.items()):
-    rgb = hex_to_rgb(hexval)
-    lab = rgb_to_lab(rgb)
-    colors[name] = {
-        "code": f"CSS{idx+1:03d}",
-        "name": name.title(),
-        "rgb": rgb,
-        "lab": lab
-    }
+    entries.append((name, f"CSS{idx+1:03d}", name.title(), hex_to_rgb(hexval)))
 
 # Tambahkan grid warna otomatis (semua kombinasi r,g,b tiap 32, total 8x8x8=512 warna)
 for r in range(0, 256, 32):
     for g in range(0, 256, 32):
         for b in range(0, 256, 32):
-            name = f"grid_{r}_{g}_{b}"
-            rgb = [r, g, b]
-            lab = rgb_to_lab(rgb)
-            colors[name] = {
-                "code": f"GRID_{r}_{g}_{b}",
-                "name": f"Grid [{r},{g},{b}]",
-                "rgb": rgb,
-                "lab": lab
-            }
+            entries.append((f"grid_{r}_{g}_{b}", f"GRID_{r}_{g}_{b}", f"Grid [{r},{g},{b}]", [r, g, b]))
+
+labs = rgb_to_lab_batch([rgb for _, _, _, rgb in entries])
+
+colors = {}
+for (key, code, name, rgb), lab in zip(entries, labs):
+    colors[key] = {
+        "code": code,
+        "name": name,
+        "rgb": rgb,
+        "lab": lab
+    }
 
 # Simpan ke file
 with open("camera_color.json", "w") as f:
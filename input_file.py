@@ -4,11 +4,18 @@ import numpy as np
 from PIL import Image
 import json
 import os
+import io
 
 def load_color_db(json_path):
     with open(json_path, "r") as f:
         return json.load(f)
 
+# Streamlit menjalankan ulang seluruh skrip tiap interaksi (mis. geser slider),
+# jadi tabel LAB dari database di-cache per path file
+@st.cache_resource
+def load_color_table(json_path):
+    return prepare_color_db(load_color_db(json_path))
+
 def rgb_to_lab(rgb):
     arr = np.uint8([[rgb]])
     lab = cv2.cvtColor(arr, cv2.COLOR_RGB2LAB)[0][0]
@@ -17,32 +24,46 @@ def rgb_to_lab(rgb):
     b = float(lab[2]) - 128.0
     return [L, a, b]
 
-def find_nearest_color(lab, color_db):
-    min_dist = float("inf")
-    best_code = None
-    best_name = None
-    best_rgb = None
-    for k, v in color_db.items():
-        db_lab = v["lab"]
-        dist = np.sqrt((lab[0]-db_lab[0])**2 + (lab[1]-db_lab[1])**2 + (lab[2]-db_lab[2])**2)
-        if dist < min_dist:
-            min_dist = dist
-            best_code = v["code"]
-            best_name = v["name"]
-            best_rgb = v["rgb"]
-    return best_code, best_name, best_rgb, min_dist
+def prepare_color_db(color_db):
+    entries = list(color_db.values())
+    lab_table = np.array([v["lab"] for v in entries], dtype=np.float64)
+    codes = [v["code"] for v in entries]
+    names = [v["name"] for v in entries]
+    rgbs = [v["rgb"] for v in entries]
+    return lab_table, codes, names, rgbs
+
+def find_nearest_color(lab, color_table):
+    lab_table, codes, names, rgbs = color_table
+    diff = lab_table - np.asarray(lab, dtype=np.float64)
+    # Bandingkan jarak kuadrat; akar cukup dihitung sekali untuk warna pemenang
+    dist2 = np.einsum("ij,ij->i", diff, diff)
+    idx = int(dist2.argmin())
+    return codes[idx], names[idx], rgbs[idx], np.sqrt(dist2[idx])
 
 def get_roi_lab(img_pil):
-    img = np.array(img_pil)
-    h, w = img.shape[:2]
+    w, h = img_pil.size
     x0, x1 = int(w*0.3), int(w*0.7)
     y0, y1 = int(h*0.3), int(h*0.7)
-    roi = img[y0:y1, x0:x1]
+    # Crop dulu di PIL supaya hanya ROI yang dikonversi ke array, bukan seluruh gambar
+    roi = np.asarray(img_pil.crop((x0, y0, x1, y1)))
     avg_rgb = np.mean(roi.reshape(-1, 3), axis=0)
     avg_rgb = [int(x) for x in avg_rgb]
     lab = rgb_to_lab(avg_rgb)
     return avg_rgb, lab
 
+# Hasil analisis di-cache berdasarkan isi file (bytes di-hash oleh Streamlit), jadi menggeser
+# slider atau rerun lain untuk gambar yang sama tidak men-decode dan menganalisis ulang
+@st.cache_data(max_entries=16)
+def analyze_upload(image_bytes, json_path):
+    img_pil = Image.open(io.BytesIO(image_bytes))
+    # Foto JPEG besar cukup di-decode pada skala yang masih >= lebar tampilan maksimum;
+    # decoder JPEG merata-rata blok saat mengecilkan, jadi warna rata-rata ROI tetap sama
+    img_pil.draft("RGB", (600, 600))
+    img_pil = img_pil.convert("RGB")
+    avg_rgb, lab = get_roi_lab(img_pil)
+    match = find_nearest_color(lab, load_color_table(json_path))
+    return img_pil, avg_rgb, lab, match
+
 st.title("Yarn Color Identification (Benang) - Upload Gambar")
 st.write("Upload gambar benang, aplikasi akan mendeteksi warna benang dan menampilkan hasil prediksi.")
 
@@ -50,16 +71,12 @@ color_json = "basic_colors_lab.json"
 if not os.path.exists(color_json):
     st.error(f"File {color_json} tidak ditemukan! Upload dulu database warna atau gunakan contoh di bawah.")
 else:
-    color_db = load_color_db(color_json)
-
     uploaded_file = st.file_uploader("Upload gambar benang (JPG/PNG)", type=["jpg","jpeg","png"])
     if uploaded_file is not None:
         # Slider untuk mengatur lebar tampilan gambar
         img_width = st.slider("Atur lebar gambar (px)", min_value=100, max_value=600, value=300)
-        img_pil = Image.open(uploaded_file).convert("RGB")
+        img_pil, avg_rgb, lab, (code, name, rgb, dist) = analyze_upload(uploaded_file.getvalue(), color_json)
         st.image(img_pil, caption="Gambar yang di-upload", width=img_width)
-        avg_rgb, lab = get_roi_lab(img_pil)
-        code, name, rgb, dist = find_nearest_color(lab, color_db)
         st.write(f"Warna rata-rata benang (ROI): RGB {avg_rgb}, LAB {lab}")
         st.write(f"Prediksi warna benang: **{name}**")
         st.write(f"Kode warna benang: `{code}`")
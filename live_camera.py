@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
 import json
+import threading
+from functools import lru_cache
 
 # Load database warna
 def load_color_db(json_path):
@@ -16,71 +18,134 @@ def rgb_to_lab(rgb):
     b = float(lab[2]) - 128.0
     return [L, a, b]
 
+# Susun database jadi tabel LAB (N,3) sekali saja, supaya pencarian per frame tanpa loop Python
+def prepare_color_db(color_db):
+    entries = list(color_db.values())
+    lab_table = np.array([v["lab"] for v in entries], dtype=np.float64)
+    codes = [v["code"] for v in entries]
+    names = [v["name"] for v in entries]
+    rgbs = [v["rgb"] for v in entries]
+    return lab_table, codes, names, rgbs
+
 # Cari warna terdekat
-def find_nearest_color(lab, color_db):
-    min_dist = float("inf")
-    best_code = None
-    best_name = None
-    best_rgb = None
-    for v in color_db.values():
-        db_lab = v["lab"]
-        dist = np.sqrt((lab[0]-db_lab[0])**2 + (lab[1]-db_lab[1])**2 + (lab[2]-db_lab[2])**2)
-        if dist < min_dist:
-            min_dist = dist
-            best_code = v["code"]
-            best_name = v["name"]
-            best_rgb = v["rgb"]
-    return best_code, best_name, best_rgb, min_dist
-
-# Ambil warna rata-rata dari ROI (tengah area gambar)
-def get_roi_lab(img):
-    h, w = img.shape[:2]
+def find_nearest_color(lab, color_table):
+    lab_table, codes, names, rgbs = color_table
+    diff = lab_table - np.asarray(lab, dtype=np.float64)
+    # Bandingkan jarak kuadrat; akar cukup dihitung sekali untuk warna pemenang
+    dist2 = np.einsum("ij,ij->i", diff, diff)
+    idx = int(dist2.argmin())
+    return codes[idx], names[idx], rgbs[idx], np.sqrt(dist2[idx])
+
+# Kotak ROI (tengah area gambar) untuk ukuran frame tertentu
+def get_roi_box(shape):
+    h, w = shape[:2]
     x0, x1 = int(w*0.4), int(w*0.6)
     y0, y1 = int(h*0.4), int(h*0.6)
+    return x0, x1, y0, y1
+
+# Ambil warna rata-rata (RGB) dari ROI
+def get_roi_rgb(img, roi_box=None):
+    x0, x1, y0, y1 = roi_box or get_roi_box(img.shape)
     roi = img[y0:y1, x0:x1]
-    avg_bgr = np.mean(roi.reshape(-1, 3), axis=0)
-    avg_bgr = [int(x) for x in avg_bgr]
+    # Rata-rata langsung di slice ROI (axis 0,1), tanpa reshape yang menyalin seluruh ROI
+    avg_bgr = [int(x) for x in np.mean(roi, axis=(0, 1))]
     # Swap ke RGB karena OpenCV pakai BGR!
-    avg_rgb = [avg_bgr[2], avg_bgr[1], avg_bgr[0]]
-    lab = rgb_to_lab(avg_rgb)
-    return avg_rgb, lab
+    return [avg_bgr[2], avg_bgr[1], avg_bgr[0]]
+
+# Rata-rata ROI selalu integer RGB dan frame berurutan sering menghasilkan nilai yang sama,
+# jadi konversi LAB + pencarian warna di-cache per tuple RGB
+def make_color_matcher(color_table, cache_size=65536):
+    @lru_cache(maxsize=cache_size)
+    def match(rgb):
+        return find_nearest_color(rgb_to_lab(list(rgb)), color_table)
+    return match
+
+# Baca frame kamera di thread terpisah, supaya cap.read() tidak menunggu analisis/tampilan.
+# Hanya frame terbaru yang disimpan; frame lama yang belum diambil dibuang.
+class CameraStream:
+    def __init__(self, src=0):
+        self.cap = cv2.VideoCapture(src)
+        # Minta stream MJPEG dari webcam (kalau didukung): bandwidth USB lebih kecil dan
+        # OpenCV cukup decode satu JPEG per frame, bukan konversi YUYV mentah
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        self.cond = threading.Condition()
+        self.frame = None
+        self.stopped = False
+        self.thread = threading.Thread(target=self._reader, daemon=True)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _reader(self):
+        while not self.stopped:
+            ret, frame = self.cap.read()
+            with self.cond:
+                if not ret:
+                    self.stopped = True
+                else:
+                    self.frame = frame
+                self.cond.notify()
+
+    # Tunggu frame baru; tiap frame hanya diberikan sekali ke pemanggil
+    def read(self):
+        with self.cond:
+            while self.frame is None and not self.stopped:
+                self.cond.wait()
+            frame, self.frame = self.frame, None
+        return frame is not None, frame
+
+    def release(self):
+        with self.cond:
+            self.stopped = True
+        if self.thread.is_alive():
+            self.thread.join()
+        self.cap.release()
 
 def main():
     color_json = "camera_color.json"
     color_db = load_color_db(color_json)
+    color_table = prepare_color_db(color_db)
+    match_color = make_color_matcher(color_table)
 
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
+    stream = CameraStream(0)
+    if not stream.isOpened():
         print("Gagal membuka kamera. Pastikan webcam tersedia.")
+        stream.release()
         return
+    stream.start()
 
     print("Tekan 'q' untuk keluar.")
+    # Resolusi kamera tetap, jadi kotak ROI cukup dihitung ulang kalau ukuran frame berubah
+    frame_shape = None
     while True:
-        ret, frame = cap.read()
+        ret, frame = stream.read()
         if not ret:
             break
 
+        if frame.shape != frame_shape:
+            frame_shape = frame.shape
+            h, w = frame_shape[:2]
+            roi_box = get_roi_box(frame_shape)
+            x0, x1, y0, y1 = roi_box
+
         # ROI deteksi warna
-        avg_rgb, lab = get_roi_lab(frame)
-        code, name, rgb, dist = find_nearest_color(lab, color_db)
+        avg_rgb = get_roi_rgb(frame, roi_box)
+        code, name, rgb, dist = match_color(tuple(avg_rgb))
 
         # Gambar kotak ROI di frame
-        h, w = frame.shape[:2]
-        x0, x1 = int(w*0.4), int(w*0.6)
-        y0, y1 = int(h*0.4), int(h*0.6)
         cv2.rectangle(frame, (x0, y0), (x1, y1), (0,255,0), 2)
 
-        # Gambar preview warna di frame
-        preview_color = np.zeros((60,60,3), dtype=np.uint8)
-        preview_color[:] = rgb[::-1]  # rgb ke BGR untuk OpenCV
-
         # Tulis hasil ke frame
         cv2.putText(frame, f"Prediksi: {name} ({code})", (10,30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255,255,255), 2)
         cv2.putText(frame, f"RGB: {avg_rgb}", (10,60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200,200,200), 2)
         cv2.putText(frame, f"Database: {rgb}, Jarak: {dist:.2f}", (10,90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (180,180,180), 2)
 
-        # Gabung preview warna ke frame (pojok kanan atas)
-        frame[10:70, w-70:w-10] = preview_color
+        # Preview warna langsung diisi ke frame (pojok kanan atas), tanpa buffer 60x60 baru tiap frame
+        frame[10:70, w-70:w-10] = rgb[::-1]  # rgb ke BGR untuk OpenCV
 
         cv2.imshow("Yarn Color Detection - Camera", frame)
 
@@ -88,7 +153,7 @@ def main():
         if cv2.waitKey(1) & 0xFF == ord('q'):
             break
 
-    cap.release()
+    stream.release()
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":